@@ -327,7 +327,7 @@ class Push:
         completed_cached_tasks = {}
         if cached_tasks:
             completed_cached_tasks = {
-                t.id: vars(t) for t in cached_tasks if t.state == "completed"
+                t.id: t.to_json() for t in cached_tasks if t.state == "completed"
             }
             tasks = [{**t, **completed_cached_tasks.get(t["id"], {})} for t in tasks]
 
@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import collections
-import os
+import concurrent.futures
+import re
+import sys
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from datetime import datetime
-from enum import Enum
-from inspect import signature
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from enum import IntEnum
+from functools import lru_cache
 from statistics import median
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import requests
 import taskcluster
@@ -25,10 +27,11 @@ from mozci.util.taskcluster import (
     get_artifact,
     get_task,
     list_artifacts,
+    list_artifacts_many,
 )
 
 
-class Status(Enum):
+class Status(IntEnum):
     PASS = 0
     FAIL = 1
     INTERMITTENT = 2
@@ -72,15 +75,14 @@ SUITES = (
     "test-coverage",
     "jittest",
 )
+_SUITE_RE = re.compile("-(" + "|".join(re.escape(s) for s in SUITES) + ")-")
 
 
 # We can stop relying on parsing the label when https://bugzilla.mozilla.org/show_bug.cgi?id=1632870 is fixed.
+@lru_cache(maxsize=4096)
 def get_configuration_from_label(label: str) -> str:
     # Remove the suite name.
-    config = label
-    for s in SUITES:
-        if f"-{s}-" in config:
-            config = config.replace(s, "*")
+    config = _SUITE_RE.sub("-*-", label)
 
     # Remove the chunk number.
     parts = config.split("-")
@@ -99,23 +101,27 @@ NO_GROUPS_SUITES = (
     "jittest",  # https://bugzilla.mozilla.org/show_bug.cgi?id=1617633
     "marionette",  # https://bugzilla.mozilla.org/show_bug.cgi?id=1636088
 )
+_NO_GROUPS_RE = re.compile(
+    "-(" + "|".join(re.escape(s) for s in NO_GROUPS_SUITES) + ")-"
+)
 
 
+@lru_cache(maxsize=4096)
 def is_no_groups_suite(label):
-    return any(f"-{s}-" in label for s in NO_GROUPS_SUITES)
+    return _NO_GROUPS_RE.search(label) is not None
+
 
+_WPT_RE = re.compile("web-platform-tests|test-verify-wpt|test-coverage-wpt")
 
 slash_group_warned = False
+_SLASH_GROUP_WARNED_LOCK = threading.Lock()
+
+# Empty groups, file URLs, Windows paths, absolute paths and paths containing backslashes.
+_BAD_GROUP_RE = re.compile(r"\A(?:\s*\Z|file://|Z:|/)|\\")
 
 
 def is_bad_group(task_id: str, group: str) -> bool:
-    bad_group = (
-        not group.strip()
-        or group.startswith("file://")
-        or group.startswith("Z:")
-        or os.path.isabs(group)
-        or "\\" in group
-    )
+    bad_group = _BAD_GROUP_RE.search(group) is not None
 
     if bad_group:
         logger.error(f"Bad group name in task {task_id}: '{group}'")
@@ -124,6 +130,7 @@ def is_bad_group(task_id: str, group: str) -> bool:
 
 
 # Transform WPT group names to a full relative path in mozilla-central.
+@lru_cache(maxsize=65536)
 def wpt_workaround(group: str) -> str:
     # No need to transform empty groups (also, they will be filtered out
     # in a following step).
@@ -153,6 +160,14 @@ class Task:
     tags: Dict = field(default_factory=dict)
     tier: Optional[int] = field(default=None)
 
+    def __post_init__(self):
+        # These values are mostly shared across tasks (e.g. labels of retriggers,
+        # "failed", "completed"), intern them to save memory and speed up comparisons.
+        for name in ("label", "result", "state", "classification"):
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, sys.intern(value))
+
     @staticmethod
     def create(index=None, root_url=PRODUCTION_TASKCLUSTER_ROOT_URL, **kwargs):
         """Factory method to create a new Task instance.
@@ -186,7 +201,7 @@ class Task:
     def is_retrigger(self) -> bool:
         return self.tags.get("action", "").startswith("retrigger-")
 
-    @property
+    @memoized_property
     def failed(self):
         return self.result in ("failed", "exception")
 
@@ -195,6 +210,25 @@ class Task:
         """List the artifacts that were uploaded by this task."""
         return [artifact["name"] for artifact in list_artifacts(self.id)]
 
+    @staticmethod
+    def list_artifacts_batch(tasks):
+        """List the artifacts that were uploaded by each of the given tasks.
+
+        The listings are fetched concurrently.
+
+        Args:
+            tasks (list): The :class:`~mozci.task.Task` objects to list artifacts for.
+
+        Returns:
+            dict: A mapping from task ids to the names of their artifacts.
+        """
+        return {
+            task_id: [artifact["name"] for artifact in artifacts]
+            for task_id, artifacts in list_artifacts_many(
+                [task.id for task in tasks]
+            ).items()
+        }
+
     def get_artifact(self, path, root_url=PRODUCTION_TASKCLUSTER_ROOT_URL):
         """Downloads and returns the content of an artifact.
 
@@ -220,6 +254,27 @@ class Task:
 
         return data
 
+    def get_artifacts(self, paths, root_url=PRODUCTION_TASKCLUSTER_ROOT_URL):
+        """Downloads and returns the content of multiple artifacts concurrently.
+
+        Args:
+            paths (list): The path components of the artifact URLs, see
+                          :meth:`~mozci.task.Task.get_artifact`.
+
+        Returns:
+            list: Contents of the artifacts, in the same order as `paths`.
+
+        Raises:
+            :class:`~mozci.errors.ArtifactNotFound`: When one of the requested
+                artifacts does not exist.
+        """
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            return list(
+                executor.map(
+                    lambda path: self.get_artifact(path, root_url=root_url), paths
+                )
+            )
+
     def to_json(self):
         """A JSON compatible representation of this Task in dictionary form.
 
@@ -228,16 +283,16 @@ class Task:
         Returns:
             dict: A JSON-compatible representation of the task.
         """
-        sig = signature(self.__init__)
-        return {k: v for k, v in self.__dict__.items() if k in sig.parameters}
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
 
     def retrigger(self):
         """This function implements ability to perform retriggers on tasks"""
         new_task_id = taskcluster.slugId()
         task = get_task(self.id)
         task["payload"]["id"] = new_task_id
-        task["created"] = taskcluster.stringDate(datetime.utcnow())
-        task["deadline"] = taskcluster.stringDate(taskcluster.fromNow("90 minutes"))
+        now = datetime.utcnow()
+        task["created"] = taskcluster.stringDate(now)
+        task["deadline"] = taskcluster.stringDate(now + timedelta(minutes=90))
 
         if self._should_retrigger(task) == "false":
             logger.info(
@@ -258,11 +313,21 @@ class Task:
 class GroupResult:
     """Contains information relating to a single group failure within a TestTask."""
 
+    __slots__ = ("group", "ok", "duration")
+
     group: str
     ok: bool
     # TODO: 'Optional' can be removed once https://github.com/mozilla/mozci/issues/662 is fixed.
     duration: Optional[int]
 
+    def __setstate__(self, state):
+        # Results cached before __slots__ was introduced were pickled with a
+        # __dict__ state instead of a (None, slots) tuple.
+        if isinstance(state, tuple):
+            state = state[1]
+        for name, value in state.items():
+            setattr(self, name, value)
+
 
 @dataclass
 class TestTask(Task):
@@ -271,12 +336,9 @@ class TestTask(Task):
     _results: Optional[List[GroupResult]] = field(default=None)
     _errors: Optional[List] = field(default=None)
 
-    @property
+    @memoized_property
     def is_wpt(self):
-        return any(
-            s in self.label
-            for s in {"web-platform-tests", "test-verify-wpt", "test-coverage-wpt"}
-        )
+        return _WPT_RE.search(self.label) is not None
 
     def retrieve_results(self, push):
         global slash_group_warned
@@ -295,39 +357,45 @@ class TestTask(Task):
             return
 
         if self.state == "completed":
-            self._results = [
-                GroupResult(group, result, duration)
-                for group, (result, duration) in data.handler.get(
-                    "test_task_groups", branch=push.branch, rev=push.rev, task=self
-                ).items()
-            ]
+            groups = data.handler.get(
+                "test_task_groups", branch=push.branch, rev=push.rev, task=self
+            )
         else:
-            self._results = []
+            groups = {}
+
+        is_wpt = self.is_wpt
+        task_id = self.id
+
+        results = []
+        saw_slash_group = False
+        for group, (result, duration) in groups.items():
+            # Apply WPT workaround, needed at least until bug 1632546 is fixed.
+            if is_wpt:
+                # TODO: It can be removed a year after https://bugzilla.mozilla.org/show_bug.cgi?id=1688043 is fixed.
+                # Filter out "/" groups.
+                if group == "/":
+                    saw_slash_group = True
+                    continue
 
-        # Apply WPT workaround, needed at least until bug 1632546 is fixed.
-        if self.is_wpt:
-            # TODO: It can be removed a year after https://bugzilla.mozilla.org/show_bug.cgi?id=1688043 is fixed.
-            # Filter out "/" groups.
-            if not slash_group_warned and any(
-                result.group == "/" for result in self._results
-            ):
-                slash_group_warned = True
-                logger.warning(f"'/' group name in task {self.id}")
-
-            self._results = [result for result in self._results if result.group != "/"]
-
-            for result in self._results:
-                result.group = wpt_workaround(result.group)
-
-        # Filter out groups with bad names.
-        # TODO: Figure out why we still have some groups with bad names.
-        self._results = [
-            result
-            for result in self._results
-            if not is_bad_group(self.id, result.group)
-        ]
+                group = wpt_workaround(group)
 
-    @property
+            # Filter out groups with bad names.
+            # TODO: Figure out why we still have some groups with bad names.
+            if is_bad_group(task_id, group):
+                continue
+
+            results.append(GroupResult(group, result, duration))
+
+        if saw_slash_group and not slash_group_warned:
+            # Results are retrieved concurrently, make sure we only warn once.
+            with _SLASH_GROUP_WARNED_LOCK:
+                if not slash_group_warned:
+                    slash_group_warned = True
+                    logger.warning(f"'/' group name in task {task_id}")
+
+        self._results = results
+
+    @memoized_property
     def groups(self):
         return [result.group for result in self.results]
 
@@ -336,13 +404,17 @@ class TestTask(Task):
         assert self._results is not None
         return self._results
 
+    @memoized_property
+    def results_by_group(self) -> Dict[str, GroupResult]:
+        return {result.group: result for result in self.results}
+
     @property
     def errors(self):
         if self._errors is None:
             self._errors = data.handler.get("test_task_errors", task=self)
         return self._errors
 
-    @property
+    @memoized_property
     def configuration(self) -> str:
         assert self.label is not None
         return get_configuration_from_label(self.label)
@@ -395,25 +467,29 @@ class GroupSummary(RunnableSummary):
         # will fail unless normalized.
         if self.name.startswith("/"):
             self.name = wpt_workaround(self.name)
-        assert all(self.name in t.groups for t in self.tasks)
+        assert all(self.name in t.results_by_group for t in self.tasks)
+
+    @memoized_property
+    def matching(self) -> List[Tuple[TestTask, GroupResult]]:
+        # List all (task, result) pairs for that group.
+        matching = []
+        for task in self.tasks:
+            result = task.results_by_group.get(self.name)
+            if result is not None:
+                matching.append((task, result))
+        return matching
 
     @property
     def classifications(self):
         return [
-            (t.classification, t.classification_note)
-            for t in self.tasks
-            if t.failed
-            and any(result.group == self.name and not result.ok for result in t.results)
+            (task.classification, task.classification_note)
+            for task, result in self.matching
+            if task.failed and not result.ok
         ]
 
     @property
     def durations(self) -> List[int]:
-        data = []
-        for task in self.tasks:
-            for result in task.results:
-                if result.group == self.name:
-                    data.append(result.duration)
-        return data
+        return [result.duration for _, result in self.matching]
 
     @property
     def total_duration(self):
@@ -425,32 +501,28 @@ class GroupSummary(RunnableSummary):
 
     @memoized_property
     def status(self):
-        overall_status_by_label = {}
-        for task in self.tasks:
-            for result in task.results:
-                if result.group != self.name:
-                    continue
-
-                if not result.ok:
-                    status = Status.FAIL
-                else:
-                    status = Status.PASS
+        # For each label, keep track of whether the manifest passed (bit 1) and
+        # whether it failed (bit 2) in at least one of the tasks.
+        seen_by_label: Dict[str, int] = {}
+        for task, result in self.matching:
+            seen_by_label[task.label] = seen_by_label.get(task.label, 0) | (
+                1 if result.ok else 2
+            )
 
-                if task.label not in overall_status_by_label:
-                    overall_status_by_label[task.label] = status
-                elif status != overall_status_by_label[task.label]:
-                    overall_status_by_label[task.label] = Status.INTERMITTENT
+        # Aggregate over all labels: bit 1 is set if the manifest failed
+        # intermittently in a label, bit 2 if it consistently failed in a label.
+        overall = 0
+        for seen in seen_by_label.values():
+            overall |= 1 if seen == 3 else seen & 2
 
         # If the manifest failed intermittently at least in one task, we
         # consider it to be intermittent.
-        if any(
-            status == Status.INTERMITTENT for status in overall_status_by_label.values()
-        ):
+        if overall & 1:
             return Status.INTERMITTENT
 
         # Otherwise, if the manifest failed at least once in any of the tasks,
         # we consider it as a failure.
-        if any(status == Status.FAIL for status in overall_status_by_label.values()):
+        if overall & 2:
             return Status.FAIL
 
         # Otherwise, the manifest passed in all tasks, so we consider it a pass.
@@ -459,38 +531,30 @@ class GroupSummary(RunnableSummary):
     @memoized_property
     def failing_tasks(self):
         # List all tasks with some test results failing for that group
-        return [
-            task
-            for task in self.tasks
-            if any(
-                not result.ok and result.group == self.name for result in task.results
-            )
-        ]
+        return [task for task, result in self.matching if not result.ok]
 
     def is_config_consistent_failure(self, minimum_count: int = 3) -> Optional[bool]:
-        config_to_results = collections.defaultdict(list)
-        for task in self.tasks:
-            for result in task.results:
-                if result.group == self.name:
-                    config_to_results[task.configuration].append(result.ok)
+        # Count runs and failures per configuration.
+        runs_by_config: Dict[str, int] = {}
+        failures_by_config: Dict[str, int] = {}
+        for task, result in self.matching:
+            config = task.configuration
+            runs_by_config[config] = runs_by_config.get(config, 0) + 1
+            if not result.ok:
+                failures_by_config[config] = failures_by_config.get(config, 0) + 1
 
         # If there is no config for which we have at least 'minimum_count' runs, return None (that is, unknown).
-        if all(len(results) < minimum_count for results in config_to_results.values()):
+        if all(runs < minimum_count for runs in runs_by_config.values()):
             return None
 
         # Return True if there is at least one configuration for which we have only failures, False otherwise.
         return any(
-            len(results) >= minimum_count and not any(results)
-            for results in config_to_results.values()
+            runs >= minimum_count and failures_by_config.get(config, 0) == runs
+            for config, runs in runs_by_config.items()
         )
 
     def is_cross_config_failure(self, minimum_count: int = 2) -> Optional[bool]:
-        states = [
-            result.ok
-            for task in self.tasks
-            for result in task.results
-            if result.group == self.name
-        ]
+        states = [result.ok for _, result in self.matching]
 
         nb = len(states)
         nb_passed = sum(states)  # Number of True booleans in the states list
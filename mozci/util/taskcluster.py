@@ -3,6 +3,7 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import concurrent.futures
 import os
 
 import markdown2
@@ -67,6 +68,16 @@ def list_artifacts(task_id):
     return queue.listLatestArtifacts(task_id)["artifacts"]
 
 
+def list_artifacts_many(task_ids, max_workers=64):
+    """
+    Returns a dict mapping each of the given task ids to the list of its
+    artifacts, fetching them concurrently.
+    """
+    task_ids = list(task_ids)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(task_ids, executor.map(list_artifacts, task_ids)))
+
+
 def get_index_url(index_path, root_url=PRODUCTION_TASKCLUSTER_ROOT_URL):
     return liburls.api(
         root_url,
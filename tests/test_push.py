@@ -6,10 +6,11 @@ from itertools import count
 
 import pytest
 
-from mozci import config
+from mozci import config, data
 from mozci.data.sources import bugbug
 from mozci.errors import (
     ChildPushNotFound,
+    MissingDataError,
     ParentPushNotFound,
     PushNotFound,
     SourcesNotFound,
@@ -370,6 +371,41 @@ def test_push_tasks_with_cached_uncompleted_tasks(monkeypatch, responses):
     assert len(tasks) == 1
 
 
+def test_unfinalized_push_tasks_with_cached_completed_tasks(monkeypatch, responses):
+    rev = "abcdef"
+    branch = "autoland"
+
+    cached_tasks = [
+        Task.create(id="abc123", label="test-task", result="failed", state="completed")
+    ]
+    # Values cached by memoized properties should not be forwarded to the new tasks.
+    assert cached_tasks[0].configuration == "test-task"
+    assert cached_tasks[0].failed
+    monkeypatch.setattr(config.cache, "get", lambda x: cached_tasks)
+    monkeypatch.setattr(Push, "is_finalized", False)
+
+    def mock_data_handler_get(name, **kwargs):
+        if name == "push_tasks":
+            return [{"id": "abc123", "label": "test-task", "state": "completed"}]
+        raise MissingDataError("No data")
+
+    monkeypatch.setattr(data.handler, "get", mock_data_handler_get)
+
+    responses.add(
+        responses.GET,
+        f"https://hg.mozilla.org/integration/autoland/json-automationrelevance/{rev}",
+        json={"changesets": [{"node": rev, "pushdate": [1638349140]}]},
+        status=200,
+    )
+
+    push = Push(rev, branch)
+    tasks = push.tasks
+    assert len(tasks) == 1
+    assert tasks[0].id == "abc123"
+    assert tasks[0].label == "test-task"
+    assert tasks[0].failed
+
+
 def test_push_tasks_with_cached_completed_tasks(monkeypatch, responses):
     rev = "abcdef"
     branch = "autoland"
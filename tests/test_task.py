@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import json
+import pickle
 import re
 
 import pytest
 
+import mozci.task
+from mozci import data
 from mozci.errors import ArtifactNotFound, TaskNotFound
 from mozci.task import GroupResult, GroupSummary, Task
-from mozci.util.taskcluster import get_artifact_url, get_index_url
+from mozci.util.taskcluster import get_artifact_url, get_index_url, list_artifacts_many
 
 GR_2 = GroupResult(group="group2", ok=True, duration=42)
 GR_3 = GroupResult(group="group2", ok=True, duration=42)
@@ -46,6 +49,54 @@ def test_missing_artifacts(responses, create_task):
         task.get_artifact(artifact)
 
 
+def test_get_artifacts(responses, create_task):
+    task = create_task(label="foobar")
+
+    for i in range(3):
+        responses.add(
+            responses.GET,
+            get_artifact_url(task.id, f"public/artifact{i}.json"),
+            json={"index": i},
+            status=200,
+        )
+
+    assert task.get_artifacts([f"public/artifact{i}.json" for i in range(3)]) == [
+        {"index": 0},
+        {"index": 1},
+        {"index": 2},
+    ]
+
+    responses.add(
+        responses.GET,
+        get_artifact_url(task.id, "public/missing.json"),
+        status=404,
+    )
+
+    with pytest.raises(ArtifactNotFound):
+        task.get_artifacts(["public/artifact0.json", "public/missing.json"])
+
+
+def test_list_artifacts_many(responses):
+    for task_id in ("1", "2"):
+        responses.add(
+            responses.GET,
+            f"https://firefox-ci-tc.services.mozilla.com/api/queue/v1/task/{task_id}/artifacts",
+            json={"artifacts": [{"name": f"public/{task_id}.log"}]},
+            status=200,
+        )
+
+    assert list_artifacts_many(["1", "2"]) == {
+        "1": [{"name": "public/1.log"}],
+        "2": [{"name": "public/2.log"}],
+    }
+
+    tasks = [Task.create(id="1"), Task.create(id="2")]
+    assert Task.list_artifacts_batch(tasks) == {
+        "1": ["public/1.log"],
+        "2": ["public/2.log"],
+    }
+
+
 def test_create(responses):
     # Creating a task with just a label doesn't work.
     with pytest.raises(TypeError):
@@ -172,6 +223,19 @@ def test_configuration():
     )
 
 
+def test_GroupResult_pickle():
+    result = GroupResult(group="group1", ok=False, duration=42)
+    assert pickle.loads(pickle.dumps(result)) == result
+
+    # Result pickled (protocol 4) before GroupResult had __slots__.
+    old_pickle = (
+        b"\x80\x04\x95J\x00\x00\x00\x00\x00\x00\x00\x8c\nmozci.task\x94\x8c\x0b"
+        b"GroupResult\x94\x93\x94)\x81\x94}\x94(\x8c\x05group\x94\x8c\x06group1\x94"
+        b"\x8c\x02ok\x94\x89\x8c\x08duration\x94K*ub."
+    )
+    assert pickle.loads(old_pickle) == result
+
+
 def test_GroupSummary_classifications():
     task1 = Task.create(
         id=1,
@@ -258,6 +322,56 @@ def test_GroupSummary_classifications():
     ]
 
 
+def test_retrieve_results_filters_groups(monkeypatch):
+    push = FakePush("autoland", "rev")
+
+    groups = {
+        "/": (True, 1),
+        "/dom/test.html": (True, 2),
+        "/_mozilla/mozilla/test.html": (False, 3),
+        "/dom/back\\slash.html": (True, 4),
+        " ": (True, 5),
+    }
+    monkeypatch.setattr(data.handler, "get", lambda name, **kwargs: dict(groups))
+
+    warnings = []
+    monkeypatch.setattr(mozci.task, "slash_group_warned", False)
+    monkeypatch.setattr(
+        mozci.task.logger, "warning", lambda message: warnings.append(message)
+    )
+
+    for i in range(2):
+        task = Task.create(
+            id=i,
+            label="test-linux1804-64/opt-web-platform-tests-e10s-1",
+            state="completed",
+        )
+        task.retrieve_results(push)
+        assert task.results == [
+            GroupResult("testing/web-platform/tests/dom/test.html", True, 2),
+            GroupResult(
+                "testing/web-platform/mozilla/tests/mozilla/test.html", False, 3
+            ),
+        ]
+
+    # The '/' group is only reported once.
+    assert warnings == ["'/' group name in task 0"]
+
+    groups = {
+        "dom/tests/mochitest.ini": (True, 1),
+        "/builds/worker/mochitest.ini": (True, 2),
+        "file:///builds/worker/mochitest.ini": (True, 3),
+        "Z:/task/mochitest.ini": (True, 4),
+        "dom\\mochitest.ini": (True, 5),
+        "": (True, 6),
+    }
+    task = Task.create(
+        id=2, label="test-linux1804-64/opt-mochitest-plain-e10s-1", state="completed"
+    )
+    task.retrieve_results(push)
+    assert task.results == [GroupResult("dom/tests/mochitest.ini", True, 1)]
+
+
 def test_results_for_incomplete_task(responses):
     push = FakePush("autoland", "rev")
 